@@ -1,49 +1,133 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import contextlib
 import datetime as dt
 import email.utils
+import functools
+import hashlib
 import html
+import importlib.metadata
+import io
+import json
 import math
 import os
 import re
 import shutil
 import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 from urllib.parse import urljoin, urlparse
 from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape as xml_escape
 
 import tomllib
 
 try:
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    from jinja2 import (
+        Environment,
+        FileSystemBytecodeCache,
+        FileSystemLoader,
+        Template,
+        select_autoescape,
+    )
+    from markupsafe import Markup  # installed with jinja2
 except ImportError as exc:  # pragma: no cover - runtime dependency hint
     raise SystemExit("jinja2 is required. Run `uv sync` before generating.") from exc
 
+try:  # Optional C-backed renderer (cmark-gfm); much faster than python-markdown.
+    import cmarkgfm  # type: ignore
+    from cmarkgfm.cmark import Options as CmarkOptions  # type: ignore
+except ImportError:  # pragma: no cover - optional accelerator
+    cmarkgfm = None
+
+try:  # Optional pure-Python renderer that is still markedly faster than python-markdown.
+    import mistune  # type: ignore
+except ImportError:  # pragma: no cover - optional accelerator
+    mistune = None
+
 try:  # Prefer the markdown package but keep a basic fallback.
     import markdown  # type: ignore
 except Exception:  # pragma: no cover - fallback is intentionally simple.
     markdown = None
 
+try:  # Optional faster JSON parser for `+++json` front matter.
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
 try:
-    from PIL import Image
+    import PIL
+    from PIL import Image, UnidentifiedImageError, features
 except ImportError as exc:  # pragma: no cover - runtime dependency hint
     raise SystemExit("Pillow is required. Run `uv sync` before generating.") from exc
 
+try:  # Optional libvips backend: shrink-on-load + vectorized reduce for variant resizing.
+    import pyvips  # type: ignore
+except (ImportError, OSError):  # pragma: no cover - optional accelerator (OSError: no libvips)
+    pyvips = None
+
 ROOT = Path(__file__).resolve().parent
 POSTS_DIR = ROOT / "posts"
 STATIC_DIR = ROOT / "static"
 DIST_DIR = ROOT / "dist"
 TEMPLATES_DIR = ROOT / "templates"
+TEMPLATE_NAMES = ("index.html", "post.html")
+CACHE_DIR = ROOT / ".cache"
+IMAGE_MANIFEST_PATH = CACHE_DIR / "images.json"
 POSTS_PER_PAGE = 10
+# Below this many posts a thread pool costs more than it saves.
+PARALLEL_PARSE_MIN_POSTS = 8
+# From this many posts (and more than one core), parse in worker processes instead.
+PROCESS_PARSE_MIN_POSTS = 32
+RENDER_WORKERS = 8
 RESPONSIVE_WIDTHS = [480, 720, 1080]
+IMAGE_FORMATS_BY_SUFFIX = {
+    ".jpg": ["JPEG"],
+    ".jpeg": ["JPEG"],
+    ".png": ["PNG"],
+    ".webp": ["WEBP"],
+}
 IMAGE_SIZES_ATTR = "(max-width: 720px) 100vw, 520px"
 FEED_MAX_POSTS_DEFAULT = 25
-
-
-@dataclass
+MARKDOWN_EXTENSIONS = ["extra"]
+MISTUNE_PLUGINS = ["table", "strikethrough", "footnotes"]
+# GFM extensions minus "tagfilter", which would escape raw <iframe>/<script>/<style> tags.
+CMARK_EXTENSIONS = ["table", "strikethrough", "autolink", "tasklist"]
+# Bump when resize/encode settings change so cached variants are regenerated.
+VARIANT_CACHE_VERSION = "3"
+# Part of the variant cache key: libvips and Pillow produce different bytes for the same source.
+RESIZE_BACKEND = "pyvips" if pyvips is not None else "pillow"
+META_DESCRIPTION_MAX_CHARS = 160
+WHITESPACE_RE = re.compile(r"\s+")
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+# Strings are matched (and kept verbatim) so comments/whitespace inside them survive.
+CSS_COMMENT_RE = re.compile(r"(\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*')|/\*.*?\*/", re.DOTALL)
+CSS_SPACE_RE = re.compile(r"(\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*')|\s+")
+CSS_TIGHT_CHARS = "{};,>"
+# English month abbreviations for display dates; avoids locale-dependent strftime("%b").
+MONTH_ABBREVIATIONS = (
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+)
+
+
+@dataclass(slots=True)
 class ImageMeta:
     path: str
     width: int | None
@@ -51,6 +135,8 @@ class ImageMeta:
     srcset: list[tuple[str, int]] = field(default_factory=list)
     primary_src: str | None = None
     alt: str | None = None
+    # (mime, srcset) per modern format, in MODERN_FORMATS order.
+    sources: list[tuple[str, list[tuple[str, int]]]] = field(default_factory=list)
 
     @property
     def aspect_ratio(self) -> float | None:
@@ -59,7 +145,7 @@ class ImageMeta:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Post:
     source: Path
     title: str | None
@@ -75,30 +161,228 @@ class Post:
     images_meta: list[ImageMeta] = field(default_factory=list)
 
 
+def content_key(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def write_cache_file(path: Path, data: bytes) -> None:
+    # Write to a temp file and rename so concurrent builds never see partial entries.
+    # mkstemp gives each writer its own temp file, including threads of one process.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+def package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def make_markdown_renderer() -> tuple[str, Callable[[str], str] | None]:
+    # Returns a renderer id (part of the Markdown cache key) and the render callable.
+    # Every backend passes raw HTML through unescaped, matching python-markdown. Only
+    # python-markdown's `extra` has definition lists, abbreviations and md_in_html.
+    if cmarkgfm is not None:
+        options = CmarkOptions.CMARK_OPT_UNSAFE | CmarkOptions.CMARK_OPT_FOOTNOTES
+
+        def render_cmark(text: str) -> str:
+            return cmarkgfm.markdown_to_html_with_extensions(
+                text, options=options, extensions=CMARK_EXTENSIONS
+            )
+
+        return (
+            f"cmarkgfm-{package_version('cmarkgfm')}:{','.join(CMARK_EXTENSIONS)}",
+            render_cmark,
+        )
+    if mistune is not None and hasattr(mistune, "create_markdown"):
+        renderer = mistune.create_markdown(escape=False, plugins=MISTUNE_PLUGINS)
+        return f"mistune-{mistune.__version__}:{','.join(MISTUNE_PLUGINS)}", renderer
+    if markdown is not None:
+        # markdown.markdown() builds a fresh Markdown (and reloads every extension) per
+        # call; keep one instance per thread instead, since instances are not thread-safe.
+        local = threading.local()
+
+        def render_python_markdown(text: str) -> str:
+            md = getattr(local, "md", None)
+            if md is None:
+                md = local.md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+            return md.reset().convert(text)
+
+        return (
+            f"markdown-{markdown.__version__}:{','.join(MARKDOWN_EXTENSIONS)}",
+            render_python_markdown,
+        )
+    return "fallback", None
+
+
+MARKDOWN_RENDERER, MARKDOWN_RENDER = make_markdown_renderer()
+
+
 def render_markdown(text: str) -> str:
-    if markdown is None:
+    if MARKDOWN_RENDER is None:
         paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
         return "".join(f"<p>{p}</p>" for p in paragraphs)
-    return markdown.markdown(text, extensions=["extra"])
+    return MARKDOWN_RENDER(text)
+
+
+def markdown_cache_path(text: str) -> Path:
+    key = content_key(MARKDOWN_RENDERER.encode("utf-8"), b"\0", text.encode("utf-8"))
+    return CACHE_DIR / "md" / f"{key}.html"
+
+
+def render_markdown_cached(text: str) -> str:
+    cache_path = markdown_cache_path(text)
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        pass
+    rendered = render_markdown(text)
+    write_cache_file(cache_path, rendered.encode("utf-8"))
+    return rendered
+
+
+# Token patterns for parse_simple_front_matter(); anything else defers to tomllib.
+FM_SPACE_RE = re.compile(r"[ \t]*")
+FM_GAP_RE = re.compile(r"(?:[ \t\r\n]|#[^\n]*)*")  # whitespace, newlines, comments
+FM_LINE_END_RE = re.compile(r"[ \t]*(?:#[^\n]*)?(?:\r?\n|\Z)")
+FM_KEY_RE = re.compile(r"[A-Za-z0-9_-]+")
+FM_STRING_RE = re.compile(r'"([^"\\\x00-\x08\x0a-\x1f\x7f]*)"')
+FM_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})(?![Tt0-9]| \d)")
+FM_BOOL_RE = re.compile(r"(true|false)(?![A-Za-z0-9_-])")
+
+
+def parse_simple_front_matter(front: str) -> dict | None:
+    # Handwritten parser for the TOML subset posts actually use: bare keys with basic
+    # strings, dates, booleans, and (multi-line) arrays of those or of inline tables.
+    # Returns None for anything outside that subset so tomllib parses (or rejects) it.
+    def parse_value(pos: int) -> tuple[object, int]:
+        match = FM_STRING_RE.match(front, pos)
+        if match:
+            return match.group(1), match.end()
+        match = FM_DATE_RE.match(front, pos)
+        if match:
+            return dt.date.fromisoformat(match.group(1)), match.end()
+        match = FM_BOOL_RE.match(front, pos)
+        if match:
+            return match.group(1) == "true", match.end()
+        if front.startswith("[", pos):
+            items: list = []
+            pos = FM_GAP_RE.match(front, pos + 1).end()
+            while not front.startswith("]", pos):
+                item, pos = parse_value(pos)
+                items.append(item)
+                pos = FM_GAP_RE.match(front, pos).end()
+                if front.startswith(",", pos):
+                    pos = FM_GAP_RE.match(front, pos + 1).end()
+                elif not front.startswith("]", pos):
+                    raise ValueError("unsupported array")
+            return items, pos + 1
+        if front.startswith("{", pos):
+            table: dict = {}
+            pos = FM_SPACE_RE.match(front, pos + 1).end()
+            while not front.startswith("}", pos):
+                pos = parse_key_value(pos, table)
+                pos = FM_SPACE_RE.match(front, pos).end()
+                if front.startswith(",", pos):
+                    pos = FM_SPACE_RE.match(front, pos + 1).end()
+                    if front.startswith("}", pos):
+                        raise ValueError("trailing comma in inline table")
+                elif not front.startswith("}", pos):
+                    raise ValueError("unsupported inline table")
+            return table, pos + 1
+        raise ValueError("unsupported value")
+
+    def parse_key_value(pos: int, target: dict) -> int:
+        match = FM_KEY_RE.match(front, pos)
+        if not match or match.group() in target:
+            raise ValueError("unsupported key")
+        pos = FM_SPACE_RE.match(front, match.end()).end()
+        if not front.startswith("=", pos):
+            raise ValueError("expected =")
+        pos = FM_SPACE_RE.match(front, pos + 1).end()
+        target[match.group()], pos = parse_value(pos)
+        return pos
+
+    data: dict = {}
+    pos = 0
+    try:
+        while True:
+            pos = FM_GAP_RE.match(front, pos).end()
+            if pos >= len(front):
+                return data
+            pos = parse_key_value(pos, data)
+            match = FM_LINE_END_RE.match(front, pos)
+            if not match:
+                return None
+            pos = match.end()
+    except ValueError:
+        return None
+
+
+def load_json_front_matter(front: str) -> dict:
+    data = orjson.loads(front) if orjson is not None else json.loads(front)
+    if not isinstance(data, dict):
+        raise TypeError("JSON front matter must be an object")
+    return data
 
 
 def parse_front_matter(raw: str) -> tuple[dict, str]:
-    lines = raw.splitlines()
-    if not lines:
+    if not raw:
         raise ValueError("Empty post")
 
-    delimiter = lines[0].strip()
+    # Scan the source string directly instead of splitting the whole post into lines;
+    # the closing delimiter is usually within the first few lines.
+    first_nl = raw.find("\n")
+    if first_nl < 0:
+        first_nl = len(raw)
+
+    # `+++json` / `++++json` opens a JSON front matter block closed by the bare delimiter.
+    delimiter = raw[:first_nl].strip()
+    front_format = "toml"
+    if delimiter.endswith("json"):
+        delimiter = delimiter[: -len("json")]
+        front_format = "json"
     if delimiter not in ("+++", "++++"):
         raise ValueError("Front matter must start with +++ or ++++")
 
-    try:
-        end_idx = next(i for i, line in enumerate(lines[1:], start=1) if line.strip() == delimiter)
-    except StopIteration as exc:  # pragma: no cover - guardrail
-        raise ValueError(f"Front matter closing {delimiter} not found") from exc
-
-    front = "\n".join(lines[1:end_idx])
-    body = "\n".join(lines[end_idx + 1 :]).lstrip()
-    data = tomllib.loads(front)
+    # The closing line is the bare delimiter, give or take surrounding whitespace / CRLF.
+    pos = first_nl + 1
+    while True:
+        idx = raw.find(delimiter, pos)
+        if idx < 0:
+            raise ValueError(f"Front matter closing {delimiter} not found")
+        line_start = raw.rfind("\n", 0, idx) + 1
+        line_end = raw.find("\n", idx)
+        if line_end < 0:
+            line_end = len(raw)
+        if raw[line_start:line_end].strip() == delimiter:
+            break
+        pos = idx + len(delimiter)
+
+    front = raw[first_nl + 1 : line_start]
+    body = raw[line_end + 1 :].lstrip()
+    if "\r" in body:
+        body = "\n".join(body.splitlines())
+    elif body.endswith("\n"):
+        body = body[:-1]
+    if front_format == "json":
+        data = load_json_front_matter(front)
+    else:
+        data = parse_simple_front_matter(front)
+        if data is None:
+            data = tomllib.loads(front)
     return data, body
 
 
@@ -134,7 +418,7 @@ def parse_images(meta: dict, source: Path) -> tuple[list[str], list[str | None]]
 
 
 def parse_post(path: Path) -> Post:
-    raw = path.read_text(encoding="utf-8")
+    raw = path.read_bytes().removeprefix(codecs.BOM_UTF8).decode("utf-8")
     meta, body_md = parse_front_matter(raw)
 
     try:
@@ -148,8 +432,8 @@ def parse_post(path: Path) -> Post:
     layout = meta.get("layout", "photo")
     slug = path.stem
 
-    body_html = render_markdown(body_md) if body_md.strip() else ""
-    display_date = date.strftime("%d %b %Y")
+    body_html = render_markdown_cached(body_md) if body_md.strip() else ""
+    display_date = f"{date.day:02d} {MONTH_ABBREVIATIONS[date.month - 1]} {date.year}"
     url = f"{date.year}/{date.month:02d}/{slug}/"
 
     return Post(
@@ -167,10 +451,38 @@ def parse_post(path: Path) -> Post:
     )
 
 
+def iter_markdown_files(root: str | os.PathLike) -> Iterable[str]:
+    # Plain strings all the way down; Path objects are only built for the posts themselves.
+    # Symlinked directories are not descended into (as with rglob), so a loop cannot recurse.
+    subdirs: list[str] = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    yield entry.path
+    except FileNotFoundError:
+        return
+    for subdir in subdirs:
+        yield from iter_markdown_files(subdir)
+
+
 def collect_posts() -> list[Post]:
-    posts: list[Post] = []
-    for md in sorted(POSTS_DIR.glob("**/*.md")):
-        posts.append(parse_post(md))
+    # Sort by path components so ordering matches the previous Path-based glob.
+    paths = sorted(iter_markdown_files(POSTS_DIR), key=lambda p: p.split(os.sep))
+    cpu_count = os.cpu_count() or 1
+    if len(paths) < PARALLEL_PARSE_MIN_POSTS:
+        posts = [parse_post(Path(p)) for p in paths]
+    elif len(paths) >= PROCESS_PARSE_MIN_POSTS and cpu_count > 1:
+        # Front matter + Markdown rendering is CPU-bound Python, so large trees go to
+        # processes; below the threshold, pool startup would cost more than it saves.
+        with ProcessPoolExecutor(max_workers=cpu_count) as executor:
+            posts = list(executor.map(parse_post, map(Path, paths), chunksize=16))
+    else:
+        workers = min(32, cpu_count * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            posts = list(executor.map(parse_post, map(Path, paths)))
     posts.sort(key=lambda p: p.date, reverse=True)
     return posts
 
@@ -198,54 +510,447 @@ def ensure_empty_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def image_dimensions(image_path: Path) -> tuple[int | None, int | None]:
-    if not image_path.exists():
-        return None, None
+# Per-source manifest: path -> (mtime_ns, size, width, height, content digest or None).
+# A matching stat skips both the dimension probe and re-hashing the source bytes.
+IMAGE_MANIFEST: dict[str, tuple[int, int, int | None, int | None, str | None]] = {}
+
+
+def load_image_manifest() -> None:
+    try:
+        data = json.loads(IMAGE_MANIFEST_PATH.read_text(encoding="utf-8"))
+        entries = {path: tuple(entry) for path, entry in data.items() if len(entry) == 5}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return
+    IMAGE_MANIFEST.update(entries)
+
+
+def save_image_manifest() -> None:
+    data = json.dumps(IMAGE_MANIFEST, sort_keys=True)
+    try:
+        if IMAGE_MANIFEST_PATH.read_text(encoding="utf-8") == data:
+            return
+    except OSError:
+        pass
+    write_cache_file(IMAGE_MANIFEST_PATH, data.encode("utf-8"))
 
+
+# SOFn markers carry the frame size; C4 (DHT), C8 (JPG) and CC (DAC) share the range but do not.
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field: TEM, RSTn, SOI.
+JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD9)})
+
+
+def read_jpeg_dimensions(fh) -> tuple[int, int] | None:
+    fh.seek(2)
+    while True:
+        byte = fh.read(1)
+        if byte != b"\xff":
+            return None
+        marker = fh.read(1)
+        while marker == b"\xff":  # fill bytes before the marker code
+            marker = fh.read(1)
+        if not marker or marker[0] == 0xD9:  # EOF or EOI before any frame header
+            return None
+        if marker[0] in JPEG_STANDALONE_MARKERS:
+            continue
+        segment_length = fh.read(2)
+        if len(segment_length) < 2:
+            return None
+        length = int.from_bytes(segment_length, "big")
+        if marker[0] in JPEG_SOF_MARKERS:
+            frame = fh.read(5)  # precision, height, width
+            if len(frame) < 5:
+                return None
+            return int.from_bytes(frame[3:5], "big"), int.from_bytes(frame[1:3], "big")
+        fh.seek(length - 2, os.SEEK_CUR)
+
+
+def read_webp_dimensions(header: bytes) -> tuple[int, int] | None:
+    chunk = header[12:16]
+    if chunk == b"VP8 " and header[23:26] == b"\x9d\x01\x2a":
+        width = int.from_bytes(header[26:28], "little") & 0x3FFF
+        height = int.from_bytes(header[28:30], "little") & 0x3FFF
+        return width, height
+    if chunk == b"VP8L" and header[20:21] == b"\x2f":
+        bits = int.from_bytes(header[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(header[24:27], "little") + 1, int.from_bytes(
+            header[27:30], "little"
+        ) + 1
+    return None
+
+
+def fast_image_dimensions(path: str) -> tuple[int, int] | None:
+    # Read the size straight from the container header (PNG IHDR, JPEG SOFn, WebP VP8*),
+    # touching a few hundred bytes instead of building a Pillow image. None means "ask Pillow".
+    try:
+        with open(path, "rb") as fh:
+            header = fh.read(32)
+            if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+                return int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big")
+            if header.startswith(b"\xff\xd8"):
+                return read_jpeg_dimensions(fh)
+            if header.startswith(b"RIFF") and header[8:12] == b"WEBP":
+                return read_webp_dimensions(header)
+    except OSError:
+        return None
+    return None
+
+
+@functools.cache
+def probe_image_dimensions(path: str, mtime_ns: int, size: int) -> tuple[int | None, int | None]:
+    cached = IMAGE_MANIFEST.get(path)
+    if cached and cached[0] == mtime_ns and cached[1] == size:
+        return cached[2], cached[3]
+
+    dimensions = fast_image_dimensions(path)
+    if not dimensions:
+        try:
+            with Image.open(path) as img:
+                width, height = img.size
+                dimensions = (int(width), int(height))
+        except Exception:
+            dimensions = (None, None)
+    IMAGE_MANIFEST[path] = (mtime_ns, size, *dimensions, None)
+    return dimensions
+
+
+def source_digest(source_path: Path) -> str:
+    stat = source_path.stat()
+    path = str(source_path)
+    cached = IMAGE_MANIFEST.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        if cached[4]:
+            return cached[4]
+        dimensions = (cached[2], cached[3])
+    else:
+        dimensions = probe_image_dimensions(path, stat.st_mtime_ns, stat.st_size)
+    digest = content_key(source_path.read_bytes())
+    IMAGE_MANIFEST[path] = (stat.st_mtime_ns, stat.st_size, *dimensions, digest)
+    return digest
+
+
+def image_dimensions(image_path: Path) -> tuple[int | None, int | None]:
     try:
-        with Image.open(image_path) as img:
-            width, height = img.size
-            return int(width), int(height)
-    except Exception:
+        stat = image_path.stat()
+    except OSError:
         return None, None
+    return probe_image_dimensions(str(image_path), stat.st_mtime_ns, stat.st_size)
+
+
+def imaging_backend() -> str:
+    if pyvips is not None:
+        vips_version = ".".join(str(pyvips.version(part)) for part in range(3))
+        return f"libvips {vips_version} (pyvips {pyvips.__version__})"
+    # Pillow-SIMD is a drop-in fork (same `PIL` package) released as X.Y.Z.postN; its
+    # SIMD resize kernels are picked up by Image.resize without code changes.
+    version = str(PIL.__version__)
+    name = "Pillow-SIMD" if ".post" in version else "Pillow"
+    extras = []
+    if features.check_feature("libjpeg_turbo"):
+        extras.append("libjpeg-turbo")
+    return f"{name} {version}" + (f" ({', '.join(extras)})" if extras else "")
+
+
+def open_source_image(path: Path) -> Image.Image:
+    # Restricting formats by suffix skips Pillow's probe loop; retry without it for
+    # files whose extension does not match their contents.
+    formats = IMAGE_FORMATS_BY_SUFFIX.get(path.suffix.lower())
+    try:
+        return Image.open(path, formats=formats)
+    except UnidentifiedImageError:
+        if formats is None:
+            raise
+        return Image.open(path)
 
 
-def generate_variants(
-    source_path: Path, dist_path: Path, widths: list[int], original: tuple[int | None, int | None]
-) -> list[tuple[str, int]]:
+# (width, height, [(cached path, Pillow format or None for the source format)])
+ResizeStep = tuple[int, int, list[tuple[Path, str | None]]]
+# (source path, steps from the largest width down; each step resizes the previous one)
+ResizeJob = tuple[Path, list[ResizeStep]]
+
+
+@dataclass
+class VariantPlan:
+    # Srcsets are ascending by width; the suffix-preserving one ends with the original.
+    srcset: list[tuple[str, int]] = field(default_factory=list)
+    # (mime, srcset) per modern format, in MODERN_FORMATS order.
+    sources: list[tuple[str, list[tuple[str, int]]]] = field(default_factory=list)
+    resize_jobs: list[ResizeJob] = field(default_factory=list)
+    to_copy: list[tuple[Path, Path]] = field(default_factory=list)
+    sidecar_path: Path | None = None
+    sidecar: dict | None = None
+
+
+def plan_variants(
+    source_path: Path,
+    dist_path: Path,
+    widths: list[int],
+    original: tuple[int | None, int | None],
+    dist_root: Path | None = None,
+) -> VariantPlan:
+    dist_root = dist_root or DIST_DIR
     src_width, src_height = original
     if not src_width or not src_height:
-        return []
+        return VariantPlan()
 
     suffix = source_path.suffix.lower()
     if suffix not in {".jpg", ".jpeg", ".png", ".webp"}:
-        return []
+        return VariantPlan()
 
     dist_dir = dist_path.parent
     dist_dir.mkdir(parents=True, exist_ok=True)
 
-    variants: list[tuple[str, int]] = []
-    for target_width in widths:
+    # Rendered variants are cached by source content (digest memoized in the image manifest)
+    # so unchanged photos are copied, not resized.
+    source_key = content_key(
+        VARIANT_CACHE_VERSION.encode("utf-8"),
+        RESIZE_BACKEND.encode("utf-8"),
+        source_digest(source_path).encode("utf-8"),
+    )
+    cache_dir = CACHE_DIR / "variants"
+    plan = VariantPlan(sidecar_path=cache_dir / f"{source_key}.json")
+    cached_sizes = read_variant_sidecar(plan.sidecar_path)
+    rendered_sizes: dict[str, dict[int, int]] = {"variants": {}}
+
+    # A source already in a modern format is served as-is, so it gets no twin in that format.
+    formats = [entry for entry in MODERN_FORMATS if entry[1] != suffix]
+    srcsets: dict[str, list[tuple[str, int]]] = {}
+    for fmt, _, mime in formats:
+        rendered_sizes[fmt.lower()] = {}
+        srcsets[fmt] = []
+        plan.sources.append((mime, srcsets[fmt]))
+
+    def plan_output(
+        target_width: int,
+        target_height: int,
+        target_path: Path,
+        fmt: str | None,
+        outputs: list[tuple[Path, str | None]],
+    ) -> str:
+        key = fmt.lower() if fmt else "variants"
+        cached_path = cache_dir / f"{source_key}-{target_width}w{target_path.suffix}"
+        if not target_path.exists():
+            cached = cached_sizes.get(key, {})
+            if cached.get(target_width) != target_height or not cached_path.exists():
+                outputs.append((cached_path, fmt))
+            plan.to_copy.append((cached_path, target_path))
+        rendered_sizes[key][target_width] = target_height
+        return target_path.relative_to(dist_root).as_posix()
+
+    # Responsive widths form one cascade (each resized from the next larger one), and the
+    # formats of a width share its resized image. Every step stays in the cascade even
+    # when cached so the smaller widths come out identical on partial rebuilds.
+    steps: list[ResizeStep] = []
+    for target_width in sorted(widths):
         if target_width >= src_width:
             continue
 
         target_height = max(1, round(src_height * (target_width / src_width)))
-        target_path = dist_dir / f"{source_path.stem}-{target_width}w{source_path.suffix}"
-        if not target_path.exists():
-            with Image.open(source_path) as img:
-                resized = img.resize((target_width, target_height), Image.LANCZOS)
-                fmt = (img.format or "").upper()
-                save_kwargs = {}
-                if fmt in {"JPG", "JPEG"}:
-                    save_kwargs = {"quality": 85, "optimize": True, "progressive": True}
-                elif fmt == "PNG":
-                    save_kwargs = {"optimize": True}
-                resized.save(target_path, **save_kwargs)
+        stem = f"{source_path.stem}-{target_width}w"
+        outputs: list[tuple[Path, str | None]] = []
+        variant = plan_output(
+            target_width, target_height, dist_dir / f"{stem}{source_path.suffix}", None, outputs
+        )
+        plan.srcset.append((variant, target_width))
+        for fmt, format_suffix, _ in formats:
+            variant = plan_output(
+                target_width, target_height, dist_dir / f"{stem}{format_suffix}", fmt, outputs
+            )
+            srcsets[fmt].append((variant, target_width))
+        steps.append((target_width, target_height, outputs))
+
+    steps.reverse()
+    while steps and not steps[-1][2]:
+        steps.pop()
+    if steps:
+        plan.resize_jobs.append((source_path, steps))
+
+    # The original itself is copied as-is, so only its modern-format twins need encoding.
+    outputs = []
+    for fmt, format_suffix, _ in formats:
+        variant = plan_output(
+            src_width, src_height, dist_path.with_suffix(format_suffix), fmt, outputs
+        )
+        srcsets[fmt].append((variant, src_width))
+    if outputs:
+        # Its own job: the full-size encodes are the slowest outputs and need no resize.
+        plan.resize_jobs.append((source_path, [(src_width, src_height, outputs)]))
+
+    plan.srcset.append((dist_path.relative_to(dist_root).as_posix(), src_width))
+
+    if plan.resize_jobs:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    if any(cached_sizes.get(key, {}) != sizes for key, sizes in rendered_sizes.items()):
+        plan.sidecar = {"source": [src_width, src_height]}
+        for key, sizes in rendered_sizes.items():
+            plan.sidecar[key] = [[width, height] for width, height in sorted(sizes.items())]
+    return plan
+
+
+def render_variant(job: ResizeJob) -> None:
+    if pyvips is not None:
+        render_variant_vips(job)
+        return
+    source_path, steps = job
+    widest, tallest, _ = steps[0]
+    with open_source_image(source_path) as img:
+        if img.format == "JPEG":
+            # Let libjpeg downscale during decode (1/2, 1/4, 1/8) while keeping 2x
+            # headroom over the largest width so LANCZOS still has detail to work with.
+            img.draft(img.mode, (widest * 2, tallest * 2))
+        source_format = img.format
+        img.load()
+        current = img
+        for target_width, target_height, outputs in steps:
+            if current.size != (target_width, target_height):
+                current = current.resize((target_width, target_height), Image.LANCZOS)
+            for cached_path, fmt in outputs:
+                fmt = fmt or source_format
+                encoded = current
+                if fmt in {"WEBP", "AVIF"} and encoded.mode not in {"RGB", "RGBA"}:
+                    encoded = encoded.convert("RGBA" if encoded.has_transparency_data else "RGB")
+                tmp_path = cached_path.with_name(
+                    f".{cached_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                encoded.save(tmp_path, format=fmt, **image_save_kwargs(fmt))
+                os.replace(tmp_path, cached_path)
+
+
+def render_variant_vips(job: ResizeJob) -> None:
+    source_path, steps = job
+    source_format = IMAGE_FORMATS_BY_SUFFIX[source_path.suffix.lower()][0]
+    image = None
+    for target_width, target_height, outputs in steps:
+        if image is None:
+            # thumbnail() shrinks on load (JPEG DCT scaling) and then reduces in one
+            # streaming pass. Skip EXIF auto-rotation so output matches the probed size.
+            image = pyvips.Image.thumbnail(
+                str(source_path), target_width, height=target_height, size="force", no_rotate=True
+            )
+        else:
+            image = image.thumbnail_image(target_width, height=target_height, size="force")
+        if len(outputs) > 1 or len(steps) > 1:
+            # The pipeline streams its input once; render to memory so each format and
+            # the next cascade step can reread it.
+            image = image.copy_memory()
+        for cached_path, fmt in outputs:
+            tmp_path = cached_path.with_name(
+                f".{cached_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            vips_save(image, tmp_path, fmt or source_format)
+            os.replace(tmp_path, cached_path)
+
+
+def vips_save(image, path: Path, fmt: str) -> None:
+    # Metadata is dropped like Pillow's save does; `strip` became `keep` in libvips 8.15.
+    strip = {"keep": "none"} if pyvips.at_least_libvips(8, 15) else {"strip": True}
+    if fmt == "JPEG":
+        image.jpegsave(
+            str(path), Q=85, optimize_coding=True, interlace=True, subsample_mode="on", **strip
+        )
+    elif fmt == "PNG":
+        image.pngsave(str(path), compression=9, **strip)
+    elif fmt == "WEBP":
+        image.webpsave(str(path), Q=82, effort=4, **strip)
+    elif fmt == "AVIF":
+        # Low effort keeps AV1 encodes within a few times the WebP cost.
+        image.heifsave(str(path), Q=60, compression="av1", effort=1, **strip)
+    else:  # pragma: no cover - plan_variants only admits the formats above
+        raise ValueError(f"Unsupported variant format: {fmt}")
+
+
+def run_resize_jobs(jobs: list[ResizeJob]) -> None:
+    # Resizing/encoding is CPU-bound, so spread jobs (per source: the responsive cascade
+    # and the full-size modern formats) across workers. Biggest outputs go first so a long
+    # encode does not trail behind on one worker. render_variant is module-level so it
+    # pickles under the spawn start method.
+    jobs = sorted(jobs, key=lambda job: sum(w * h for w, h, out in job[1] if out), reverse=True)
+    workers = min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        for job in jobs:
+            render_variant(job)
+        return
+    # libvips releases the GIL, so its jobs run on threads. Forking instead would copy a
+    # process whose libvips worker threads may already be running, and the child hangs.
+    executor_type = ThreadPoolExecutor if pyvips is not None else ProcessPoolExecutor
+    with executor_type(max_workers=workers) as executor:
+        list(executor.map(render_variant, jobs))
+
+
+def finish_variants(plan: VariantPlan) -> None:
+    for cached_path, target_path in plan.to_copy:
+        shutil.copyfile(cached_path, target_path)
+    if plan.sidecar is not None and plan.sidecar_path is not None:
+        write_cache_file(plan.sidecar_path, json.dumps(plan.sidecar).encode("utf-8"))
+
+
+def generate_variants(
+    source_path: Path,
+    dist_path: Path,
+    widths: list[int],
+    original: tuple[int | None, int | None],
+    dist_root: Path | None = None,
+) -> tuple[list[tuple[str, int]], list[tuple[str, list[tuple[str, int]]]]]:
+    plan = plan_variants(source_path, dist_path, widths, original, dist_root)
+    for job in plan.resize_jobs:
+        render_variant(job)
+    finish_variants(plan)
+    return plan.srcset, plan.sources
+
+
+def image_save_kwargs(fmt: str | None) -> dict:
+    fmt = (fmt or "").upper()
+    if fmt in {"JPG", "JPEG"}:
+        # 4:2:0 chroma subsampling, spelled out so it no longer depends on encoder defaults.
+        return {"quality": 85, "optimize": True, "progressive": True, "subsampling": 2}
+    if fmt == "PNG":
+        return {"optimize": True}
+    if fmt == "WEBP":
+        return {"quality": 82, "method": 4}
+    if fmt == "AVIF":
+        # Speed 8 roughly halves encode time over the default 6 at similar size; quality 50
+        # lands near libvips' Q=60 in bytes (the two scales differ).
+        return {"quality": 50, "speed": 8}
+    return {}
+
+
+def encoder_available(fmt: str, suffix: str) -> bool:
+    # Encode a 1x1 image with the real save settings: a format can be listed yet lack an
+    # encoder (libheif built HEVC-only, Pillow before 11.2 or libavif without AV1 encode).
+    errors = (KeyError, OSError, ValueError) + ((pyvips.Error,) if pyvips is not None else ())
+    try:
+        if pyvips is not None:
+            with tempfile.TemporaryDirectory() as tmp:
+                vips_save(pyvips.Image.black(1, 1), Path(tmp) / f"probe{suffix}", fmt)
+        else:
+            Image.new("RGB", (1, 1)).save(io.BytesIO(), format=fmt, **image_save_kwargs(fmt))
+    except errors:
+        return False
+    return True
 
-        variants.append((target_path.relative_to(DIST_DIR).as_posix(), target_width))
 
-    variants.append((dist_path.relative_to(DIST_DIR).as_posix(), src_width))
-    return variants
+# Extra encodes served as <picture> sources, in the order browsers should prefer them.
+# Formats the active backend cannot encode are dropped rather than failing the build.
+MODERN_FORMATS = [
+    (fmt, suffix, mime)
+    for fmt, suffix, mime in (("AVIF", ".avif", "image/avif"), ("WEBP", ".webp", "image/webp"))
+    if encoder_available(fmt, suffix)
+]
+
+
+def read_variant_sidecar(path: Path) -> dict[str, dict[int, int]]:
+    # Keyed like the sidecar itself: "variants" for the source format, else the format name.
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return {
+            key: {int(width): int(height) for width, height in sizes}
+            for key, sizes in data.items()
+            if key != "source"
+        }
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
 
 
 def choose_primary_src(
@@ -253,53 +958,63 @@ def choose_primary_src(
     fallback: str,
     target_width: int = 1040,
 ) -> str:
+    # `srcset` must be ascending by width, which generate_variants guarantees.
     if not srcset:
         return fallback
-    sorted_srcset = sorted(srcset, key=lambda item: item[1])
-    for candidate_path, candidate_width in sorted_srcset:
+    for candidate_path, candidate_width in srcset:
         if candidate_width >= target_width:
             return candidate_path
-    return sorted_srcset[-1][0]
+    return srcset[-1][0]
 
 
 def attach_image_meta(posts: list[Post]) -> None:
     cache: dict[str, tuple[int | None, int | None]] = {}
-    variants_cache: dict[str, list[tuple[str, int]]] = {}
+    fallback_srcs: dict[str, str] = {}
+    plans: dict[str, VariantPlan] = {}
 
+    # Resolve each unique source once; the per-post loop below only does dict lookups.
+    load_image_manifest()
     for post in posts:
-        metas: list[ImageMeta] = []
-        for idx, image in enumerate(post.images):
+        for image in post.images:
+            if image in cache:
+                continue
             candidate = Path(image)
-            image_path = candidate if candidate.is_absolute() else ROOT / candidate
-            alt = post.image_alts[idx] if idx < len(post.image_alts) else None
+            is_absolute = candidate.is_absolute()
+            image_path = candidate if is_absolute else ROOT / candidate
+            cache[image] = image_dimensions(image_path)
+            fallback_srcs[image] = image if is_absolute else candidate.as_posix()
+            if is_absolute:
+                plans[image] = VariantPlan()
+            else:
+                plans[image] = plan_variants(
+                    image_path, DIST_DIR / candidate, RESPONSIVE_WIDTHS, cache[image], DIST_DIR
+                )
+    save_image_manifest()
+
+    run_resize_jobs([job for plan in plans.values() for job in plan.resize_jobs])
+    for plan in plans.values():
+        finish_variants(plan)
 
-            if image not in cache:
-                cache[image] = image_dimensions(image_path)
-                if candidate.is_absolute():
-                    variants_cache[image] = []
-                else:
-                    dist_path = DIST_DIR / candidate
-                    variants_cache[image] = generate_variants(
-                        source_path=image_path,
-                        dist_path=dist_path,
-                        widths=RESPONSIVE_WIDTHS,
-                        original=cache[image],
-                    )
+    primary_srcs = {
+        image: choose_primary_src(srcset=plans[image].srcset, fallback=fallback)
+        for image, fallback in fallback_srcs.items()
+    }
 
+    for post in posts:
+        metas: list[ImageMeta] = []
+        for idx, image in enumerate(post.images):
+            alt = post.image_alts[idx] if idx < len(post.image_alts) else None
             width, height = cache[image]
-            variants = variants_cache.get(image, [])
-            primary_src = choose_primary_src(
-                srcset=variants,
-                fallback=image if candidate.is_absolute() else candidate.as_posix(),
-            )
+            plan = plans[image]
             metas.append(
                 ImageMeta(
                     path=image,
                     width=width,
                     height=height,
-                    srcset=variants,
-                    primary_src=primary_src,
+                    srcset=plan.srcset,
+                    primary_src=primary_srcs[image],
                     alt=alt,
+                    sources=plan.sources,
                 )
             )
 
@@ -310,6 +1025,16 @@ def image_src(meta: ImageMeta) -> str:
     return meta.primary_src or meta.path
 
 
+def image_preload(meta: ImageMeta) -> dict:
+    # Preload what <picture> will actually pick: its first source when there is one.
+    # The type hint lets browsers without that format skip the preload instead of wasting it.
+    if meta.sources:
+        mime, srcset = meta.sources[0]
+        src = choose_primary_src(srcset=srcset, fallback=image_src(meta))
+        return {"src": src, "srcset": srcset, "type": mime}
+    return {"src": image_src(meta), "srcset": meta.srcset, "type": None}
+
+
 def image_lcp_score(meta: ImageMeta) -> float:
     if meta.width and meta.height and meta.width > 0:
         return meta.height / meta.width
@@ -335,37 +1060,59 @@ def select_above_fold_metas(metas: Iterable[ImageMeta], count: int) -> list[Imag
     return selected
 
 
-def copy_assets() -> None:
-    shutil.copy2(ROOT / "theme.css", DIST_DIR / "style.css")
+def minify_css(css: str) -> str:
+    # Conservative minifier for the inlined theme: drop comments, collapse whitespace, and
+    # remove it next to punctuation where it can never be significant.
+    css = CSS_COMMENT_RE.sub(lambda m: m.group(1) or "", css)
+
+    def collapse(match: re.Match) -> str:
+        if match.group(1):
+            return match.group(1)
+        start, end = match.span()
+        before = css[start - 1] if start else ""
+        after = css[end] if end < len(css) else ""
+        if not before or not after or before in CSS_TIGHT_CHARS + ":" or after in CSS_TIGHT_CHARS:
+            return ""
+        return " "
+
+    return CSS_SPACE_RE.sub(collapse, css)
+
+
+def copy_assets(theme_css: bytes) -> None:
+    # theme.css is already in memory for inlining, so write it out rather than re-reading it.
+    (DIST_DIR / "style.css").write_bytes(theme_css)
     if STATIC_DIR.exists():
         shutil.copytree(STATIC_DIR, DIST_DIR / "static", dirs_exist_ok=True)
     favicon = ROOT / "favicon.png"
     if favicon.exists():
         shutil.copy2(favicon, DIST_DIR / "favicon.png")
-    robots = ROOT / "robots.txt"
-    if robots.exists():
-        shutil.copy2(robots, DIST_DIR / "robots.txt")
 
 
 def make_env() -> Environment:
+    options = {"trim_blocks": True, "lstrip_blocks": True}
+    # Compiled templates are keyed on source checksum only, so fold the
+    # environment options into the file pattern to avoid reusing stale bytecode.
+    options_key = content_key(json.dumps(options, sort_keys=True).encode("utf-8"))[:8]
+    bytecode_dir = CACHE_DIR / "jinja"
+    bytecode_dir.mkdir(parents=True, exist_ok=True)
     env = Environment(
         loader=FileSystemLoader(TEMPLATES_DIR),
         autoescape=select_autoescape(enabled_extensions=("html", "xml")),
+        bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir), f"{options_key}-%s.cache"),
+        # Templates cannot change mid-build, so skip the per-lookup mtime check.
+        auto_reload=False,
+        cache_size=400,
+        **options,
     )
-    env.trim_blocks = True
-    env.lstrip_blocks = True
+    for name in TEMPLATE_NAMES:
+        env.get_template(name)
     return env
 
 
-def compute_assets_prefix(output_file: Path, base_url: str) -> str:
+def assets_prefix_for_depth(depth: int, base_url: str) -> str:
     if base_url:
         return base_url.rstrip("/")
-    if output_file.parent == DIST_DIR:
-        rel = Path(".")
-    else:
-        rel = Path(os.path.relpath(DIST_DIR, output_file.parent))
-    rel_posix = rel.as_posix()
-    return "." if rel_posix == "." else rel_posix
+    return "/".join([".."] * depth) if depth > 0 else "."
 
 
 def is_absolute_url(value: str) -> bool:
@@ -426,13 +1173,18 @@ def feed_self_url(site: dict, path: str) -> str:
 
 
 def normalize_meta_text(value: str) -> str:
-    return re.sub(r"\s+", " ", value or "").strip()
-
-
-def render_page(env: Environment, template_name: str, output_path: Path, context: dict) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    base_url = context["site"].get("base_url", "")
-    assets_prefix = compute_assets_prefix(output_path, base_url)
+    return WHITESPACE_RE.sub(" ", value or "").strip()
+
+
+def render_page(
+    template: Template,
+    output_path: Path,
+    context: dict,
+    assets_prefix: str,
+    skip_mkdir: bool = False,
+) -> None:
+    if not skip_mkdir:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
     page_path = str(context.get("page_path", "") or "")
     page_description = normalize_meta_text(
         str(context.get("page_description") or context["site"].get("description") or "")
@@ -459,7 +1211,6 @@ def render_page(env: Environment, template_name: str, output_path: Path, context
         else:
             og_image_url = join_relative_url(prefix, og_image_path) if og_image_path else None
 
-    template = env.get_template(template_name)
     render_context = dict(context)
     render_context.update(
         assets_prefix=assets_prefix,
@@ -470,30 +1221,52 @@ def render_page(env: Environment, template_name: str, output_path: Path, context
         og_image_url=og_image_url,
         twitter_card="summary_large_image" if og_image_url else "summary",
     )
-    html = template.render(**render_context)
-    output_path.write_text(html, encoding="utf-8")
+    # Encode once and write the bytes; write_text would wrap the file in a text encoder.
+    output_path.write_bytes(template.render(**render_context).encode("utf-8"))
 
 
 def build(posts: Iterable[Post], site: dict, env: Environment) -> None:
     now = dt.datetime.now(dt.timezone.utc)
     posts_list = list(posts)
+    index_template = env.get_template("index.html")
+    post_template = env.get_template("post.html")
     eager_images_count = max(0, int(site.get("eager_images", 2) or 0))
+    base_url = site.get("base_url", "")
 
     def page_output_path(page_number: int) -> Path:
         if page_number == 1:
             return DIST_DIR / "index.html"
         return DIST_DIR / "page" / str(page_number) / "index.html"
 
-    def rel_link(from_output: Path, to_output: Path) -> str:
-        target = to_output.parent if to_output.name == "index.html" else to_output
-        rel = os.path.relpath(target, from_output.parent)
-        rel_posix = Path(rel).as_posix()
-        if not rel_posix or rel_posix == ".":
-            return "./" if to_output.name == "index.html" else rel_posix
-        return f"{rel_posix.rstrip('/')}/" if to_output.name == "index.html" else rel_posix
+    # Page 1 lives at dist/index.html and page N at dist/page/N/index.html, so
+    # pagination links and asset prefixes are fixed strings per page.
+    def pagination_href(from_page: int, to_page: int) -> str:
+        if from_page == 1:
+            return f"page/{to_page}/"
+        if to_page == 1:
+            return "../../"
+        return f"../{to_page}/"
+
+    # Output depth below dist/: index.html (0), page/N/index.html (2), YYYY/MM/slug/index.html (3).
+    assets_prefix_by_depth = {
+        depth: assets_prefix_for_depth(depth, base_url) for depth in (0, 2, 3)
+    }
 
     total_pages = max(1, math.ceil(len(posts_list) / POSTS_PER_PAGE))
-    for page_num in range(1, total_pages + 1):
+    page_table = {
+        page_num: (
+            page_output_path(page_num),
+            pagination_href(page_num, page_num - 1) if page_num > 1 else None,
+            pagination_href(page_num, page_num + 1) if page_num < total_pages else None,
+            assets_prefix_by_depth[0 if page_num == 1 else 2],
+        )
+        for page_num in range(1, total_pages + 1)
+    }
+    post_assets_prefix = assets_prefix_by_depth[3]
+    # (template, output path, context, assets prefix); rendered together on a thread pool below.
+    page_jobs: list[tuple[Template, Path, dict, str]] = []
+
+    for page_num, (output_path, prev_url, next_url, assets_prefix) in page_table.items():
         start = (page_num - 1) * POSTS_PER_PAGE
         end = start + POSTS_PER_PAGE
         page_posts = posts_list[start:end]
@@ -501,12 +1274,8 @@ def build(posts: Iterable[Post], site: dict, env: Environment) -> None:
         pagination = {
             "current_page": page_num,
             "total_pages": total_pages,
-            "prev_url": rel_link(page_output_path(page_num), page_output_path(page_num - 1))
-            if page_num > 1
-            else None,
-            "next_url": rel_link(page_output_path(page_num), page_output_path(page_num + 1))
-            if page_num < total_pages
-            else None,
+            "prev_url": prev_url,
+            "next_url": next_url,
         }
 
         index_context = {
@@ -535,11 +1304,9 @@ def build(posts: Iterable[Post], site: dict, env: Environment) -> None:
         index_context.update(
             eager_image_ids=[image_src(meta) for meta in feed_images],
             lcp_image_id=image_src(lcp_meta) if lcp_meta else None,
-            preload_image=(
-                {"src": image_src(lcp_meta), "srcset": lcp_meta.srcset} if lcp_meta else None
-            ),
+            preload_image=image_preload(lcp_meta) if lcp_meta else None,
         )
-        render_page(env, "index.html", page_output_path(page_num), index_context)
+        page_jobs.append((index_template, output_path, index_context, assets_prefix))
 
     def infer_post_description(post: Post) -> str:
         if post.excerpt:
@@ -547,10 +1314,17 @@ def build(posts: Iterable[Post], site: dict, env: Environment) -> None:
         if post.title:
             return post.title
         if post.body_html:
-            text = re.sub(r"<[^>]+>", " ", post.body_html)
-            text = normalize_meta_text(text)
+            text = normalize_meta_text(HTML_TAG_RE.sub(" ", post.body_html))
+            if len(text) > META_DESCRIPTION_MAX_CHARS:
+                # Cut at the last word boundary rather than mid-word; when the limit lands on
+                # a space, the kept text already ends with a whole word.
+                boundary = text[META_DESCRIPTION_MAX_CHARS].isspace()
+                text = text[:META_DESCRIPTION_MAX_CHARS]
+                if not boundary:
+                    head, sep, _ = text.rpartition(" ")
+                    text = head if sep else text
             if text:
-                return text[:160].rstrip()
+                return text.rstrip()
         return str(site.get("description", "") or "")
 
     for post in posts_list:
@@ -575,13 +1349,18 @@ def build(posts: Iterable[Post], site: dict, env: Environment) -> None:
             "image_sizes": IMAGE_SIZES_ATTR,
             "eager_image_ids": [image_src(meta) for meta in post_images],
             "lcp_image_id": image_src(post_lcp_meta) if post_lcp_meta else None,
-            "preload_image": (
-                {"src": image_src(post_lcp_meta), "srcset": post_lcp_meta.srcset}
-                if post_lcp_meta
-                else None
-            ),
+            "preload_image": image_preload(post_lcp_meta) if post_lcp_meta else None,
         }
-        render_page(env, "post.html", output_file, context)
+        page_jobs.append((post_template, output_file, context, post_assets_prefix))
+
+    # Create each output directory once up front (sorted, so parents come first) rather
+    # than one mkdir per page from inside the workers.
+    for directory in sorted({job[1].parent for job in page_jobs}):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    # Rendering holds the GIL, but the per-page writes overlap across threads.
+    with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as executor:
+        list(executor.map(lambda job: render_page(*job, skip_mkdir=True), page_jobs))
 
 
 def write_sitemap(posts: list[Post], site: dict) -> None:
@@ -609,50 +1388,50 @@ def write_sitemap(posts: list[Post], site: dict) -> None:
 
     sitemap_ns = "http://www.sitemaps.org/schemas/sitemap/0.9"
     image_ns = "http://www.google.com/schemas/sitemap-image/1.1"
-    ET.register_namespace("", sitemap_ns)
-    ET.register_namespace("image", image_ns)
-    urlset = ET.Element(f"{{{sitemap_ns}}}urlset")
-
-    def add_url(path: str, lastmod: str | None = None, images: list[str] | None = None) -> None:
-        url_el = ET.SubElement(urlset, f"{{{sitemap_ns}}}url")
-        loc_el = ET.SubElement(url_el, f"{{{sitemap_ns}}}loc")
-        loc_el.text = loc(path)
+
+    # Stream entries straight to disk (same layout ET.indent produced) instead of building a DOM.
+    def url_entry(path: str, lastmod: str | None = None, images: list[str] | None = None) -> str:
+        lines = ["  <url>", f"    <loc>{xml_escape(loc(path))}</loc>"]
         if lastmod:
-            lastmod_el = ET.SubElement(url_el, f"{{{sitemap_ns}}}lastmod")
-            lastmod_el.text = lastmod
+            lines.append(f"    <lastmod>{xml_escape(lastmod)}</lastmod>")
         for image_loc in images or []:
-            image_el = ET.SubElement(url_el, f"{{{image_ns}}}image")
-            image_loc_el = ET.SubElement(image_el, f"{{{image_ns}}}loc")
-            image_loc_el.text = image_loc
-
-    add_url("", lastmod=lastmod_feed)
-    for page_num in range(2, total_pages + 1):
-        add_url(f"page/{page_num}/", lastmod=lastmod_feed)
-
-    for post in posts:
-        images: list[str] = []
-        for meta in post.images_meta:
-            image_loc = asset_url(meta.path)
-            if image_loc:
-                images.append(image_loc)
-        add_url(post.url, lastmod=post.date.isoformat(), images=images or None)
+            lines.append("    <image:image>")
+            lines.append(f"      <image:loc>{xml_escape(image_loc)}</image:loc>")
+            lines.append("    </image:image>")
+        lines.append("  </url>")
+        return "\n".join(lines) + "\n"
 
     sitemap_path = DIST_DIR / "sitemap.xml"
-    tree = ET.ElementTree(urlset)
-    ET.indent(tree, space="  ")
-    tree.write(sitemap_path, encoding="utf-8", xml_declaration=True)
-    sitemap_path.write_text(
-        sitemap_path.read_text(encoding="utf-8").rstrip() + "\n", encoding="utf-8"
-    )
+    with open(sitemap_path, "w", encoding="utf-8") as handle:
+        handle.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        handle.write(f'<urlset xmlns="{sitemap_ns}" xmlns:image="{image_ns}">\n')
+        handle.write(url_entry("", lastmod=lastmod_feed))
+        handle.writelines(
+            url_entry(f"page/{page_num}/", lastmod=lastmod_feed)
+            for page_num in range(2, total_pages + 1)
+        )
 
+        for post in posts:
+            images: list[str] = []
+            for meta in post.images_meta:
+                image_loc = asset_url(meta.path)
+                if image_loc:
+                    images.append(image_loc)
+            handle.write(url_entry(post.url, lastmod=post.date.isoformat(), images=images))
+        handle.write("</urlset>\n")
 
-def rewrite_dist_robots(site: dict) -> None:
-    robots_path = DIST_DIR / "robots.txt"
-    if not robots_path.exists():
+
+def write_robots(site: dict) -> None:
+    source = ROOT / "robots.txt"
+    if not source.exists():
         return
+    robots = render_robots(source.read_text(encoding="utf-8"), site)
+    (DIST_DIR / "robots.txt").write_text(robots, encoding="utf-8")
+
 
+def render_robots(raw: str, site: dict) -> str:
     absolute_base = public_base_url(site)
-    raw_lines = robots_path.read_text(encoding="utf-8").splitlines()
+    raw_lines = raw.splitlines()
     existing_sitemaps: list[str] = []
     lines: list[str] = []
     for line in raw_lines:
@@ -670,7 +1449,7 @@ def rewrite_dist_robots(site: dict) -> None:
     if sitemap_url:
         lines.append("")
         lines.append(f"Sitemap: {sitemap_url}")
-    robots_path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+    return "\n".join(lines).rstrip() + "\n"
 
 
 def format_rfc3339(value: dt.date | dt.datetime) -> str:
@@ -728,6 +1507,18 @@ def render_feed_post_html(post: Post, site: dict) -> str:
     return "\n".join(parts).strip()
 
 
+def serialize_feed(root: ET.Element) -> bytes:
+    # Serialized in memory so the file is written once, rather than written and re-read
+    # to add the trailing newline.
+    ET.indent(root, space="  ")
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True).rstrip() + b"\n"
+
+
+def emit_file(path: Path, data: bytes) -> None:
+    # Single write point for the feeds; tests swap it to capture output in memory.
+    path.write_bytes(data)
+
+
 def write_atom_feed(posts: list[Post], site: dict) -> None:
     max_posts = max(0, int(site.get("feed_max_posts", FEED_MAX_POSTS_DEFAULT) or 0))
     feed_posts = posts[:max_posts] if max_posts else []
@@ -781,11 +1572,7 @@ def write_atom_feed(posts: list[Post], site: dict) -> None:
             content_el = ET.SubElement(entry_el, f"{{{atom_ns}}}content", {"type": "html"})
             content_el.text = content_html
 
-    feed_path = DIST_DIR / "feed.xml"
-    tree = ET.ElementTree(feed_el)
-    ET.indent(tree, space="  ")
-    tree.write(feed_path, encoding="utf-8", xml_declaration=True)
-    feed_path.write_text(feed_path.read_text(encoding="utf-8").rstrip() + "\n", encoding="utf-8")
+    emit_file(DIST_DIR / "feed.xml", serialize_feed(feed_el))
 
 
 def write_rss_feed(posts: list[Post], site: dict) -> None:
@@ -832,11 +1619,7 @@ def write_rss_feed(posts: list[Post], site: dict) -> None:
             description = normalize_meta_text(str(post.excerpt or post.title or "")) or post_url
         ET.SubElement(item, "description").text = description
 
-    rss_path = DIST_DIR / "rss.xml"
-    tree = ET.ElementTree(rss_root)
-    ET.indent(tree, space="  ")
-    tree.write(rss_path, encoding="utf-8", xml_declaration=True)
-    rss_path.write_text(rss_path.read_text(encoding="utf-8").rstrip() + "\n", encoding="utf-8")
+    emit_file(DIST_DIR / "rss.xml", serialize_feed(rss_root))
 
 
 def write_feeds(posts: list[Post], site: dict) -> None:
@@ -882,16 +1665,18 @@ def main(argv: list[str] | None = None) -> int:
         site["base_url"] = str(args.base_url)
     if args.feed_self_url is not None:
         site["feed_self_url"] = str(args.feed_self_url)
-    site["inline_style"] = (ROOT / "theme.css").read_text(encoding="utf-8")
+    theme_css = (ROOT / "theme.css").read_bytes()
+    # Minified once and marked safe so templates emit it without re-escaping per page.
+    site["inline_style"] = Markup(minify_css(theme_css.decode("utf-8")))
     ensure_empty_dir(DIST_DIR)
-    copy_assets()
+    copy_assets(theme_css)
 
     posts = collect_posts()
     attach_image_meta(posts)
     env = make_env()
     build(posts, site, env)
     write_sitemap(posts, site)
-    rewrite_dist_robots(site)
+    write_robots(site)
     write_feeds(posts, site)
 
     try:
@@ -899,6 +1684,7 @@ def main(argv: list[str] | None = None) -> int:
     except ValueError:
         rel = DIST_DIR
     print(f"Built {len(posts)} posts into {rel}")
+    print(f"Images processed with {imaging_backend()}")
     return 0
 
 
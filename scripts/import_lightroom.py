@@ -4,11 +4,16 @@
 from __future__ import annotations
 
 import argparse
+import ctypes
 import datetime as dt
+import json
 import logging
+import os
 import re
 import shutil
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
@@ -19,6 +24,13 @@ DEFAULT_DESKTOP = Path.home() / "Desktop"
 STATIC_DIR = ROOT / "blog" / "static"
 POSTS_DIR = ROOT / "blog" / "posts"
 LOGGER = logging.getLogger("import_lightroom")
+COPY_WORKERS = 8
+# Linux ioctl for a copy-on-write clone of a whole file (Btrfs, XFS, bcachefs).
+FICLONE = 0x40049409
+CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+CANDIDATE_INDEX_PATH = CACHE_HOME / "julianmontez" / "lightroom_index.json"
+# Bump when the index layout or the matching rules change so old entries are rescanned.
+CANDIDATE_INDEX_VERSION = 2
 
 # Lightroom export format: YYYMMDD-DSC_NNNN.jpg (per the request; assume 8-digit date)
 SOURCE_PATTERN = re.compile(r"^(?P<date>\d{8})-DSC_(?P<num>\d{4,})\.jpg$", re.IGNORECASE)
@@ -32,25 +44,124 @@ class Photo:
     destination: Path
 
 
-def parse_candidates(source_dir: Path) -> list[Photo]:
-    photos: list[Photo] = []
-    for path in sorted(source_dir.iterdir()):
-        if not path.is_file():
-            continue
-        match = SOURCE_PATTERN.match(path.name)
-        if not match:
-            continue
+def load_candidate_index(source_dir: Path) -> dict:
+    try:
+        data = json.loads(CANDIDATE_INDEX_PATH.read_text(encoding="utf-8"))
+        if data["version"] != CANDIDATE_INDEX_VERSION:
+            raise ValueError("stale candidate index")
+        entry = data["sources"][str(source_dir)]
+        return {
+            "mtime_ns": int(entry["mtime_ns"]),
+            "matches": {name: (date, number) for name, (date, number) in entry["matches"].items()},
+            "invalid": dict(entry["invalid"]),
+            "ignored": set(entry["ignored"]),
+        }
+    except (OSError, ValueError, TypeError, KeyError):
+        return {"mtime_ns": None, "matches": {}, "invalid": {}, "ignored": set()}
+
+
+def save_candidate_index(
+    source_dir: Path, mtime_ns: int, matches: dict, invalid: dict, ignored: set
+) -> None:
+    try:
+        data = json.loads(CANDIDATE_INDEX_PATH.read_text(encoding="utf-8"))
+        if data["version"] != CANDIDATE_INDEX_VERSION or not isinstance(data["sources"], dict):
+            raise ValueError("stale candidate index")
+    except (OSError, ValueError, TypeError, KeyError):
+        data = {"version": CANDIDATE_INDEX_VERSION, "sources": {}}
+    data["sources"][str(source_dir)] = {
+        "mtime_ns": mtime_ns,
+        "matches": {name: list(value) for name, value in sorted(matches.items())},
+        "invalid": dict(sorted(invalid.items())),
+        "ignored": sorted(ignored),
+    }
+    try:
+        CANDIDATE_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CANDIDATE_INDEX_PATH.with_name(f".{CANDIDATE_INDEX_PATH.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, CANDIDATE_INDEX_PATH)
+    except OSError as exc:
+        LOGGER.debug("Could not write candidate index %s: %s", CANDIDATE_INDEX_PATH, exc)
+
+
+def split_source_name(name: str) -> tuple[str, str] | None:
+    # Hand-rolled SOURCE_PATTERN check: most Desktop files are rejected on the suffix alone,
+    # and well-formed exports are split with slicing. isdecimal() matches what `\d` does.
+    if name[-4:].lower() != ".jpg":
+        return None
+    raw_date, number = name[:8], name[13:-4]
+    if (
+        name[8:13].upper() == "-DSC_"
+        and len(number) >= 4
+        and raw_date.isdecimal()
+        and number.isdecimal()
+    ):
+        return raw_date, number
+    # Anything unusual left over goes through the regex, which stays the source of truth.
+    match = SOURCE_PATTERN.match(name)
+    return (match.group("date"), match.group("num")) if match else None
+
+
+def match_candidate(name: str) -> tuple[str, str] | None:
+    # None for names that are not exports; ValueError for exports with an impossible date.
+    parts = split_source_name(name)
+    if not parts:
+        return None
+    raw_date, number = parts
+    date = dt.datetime.strptime(raw_date, "%Y%m%d").date()
+    return date.isoformat(), number
 
-        raw_date = match.group("date")
-        number = match.group("num")
-        try:
-            date = dt.datetime.strptime(raw_date, "%Y%m%d").date()
-        except ValueError:
-            LOGGER.warning("Skipping %s: invalid date %s", path.name, raw_date)
-            continue
 
-        dest_name = f"{date:%Y-%m-%d}-DSC_{number}{path.suffix.lower()}"
-        photos.append(Photo(path, date, number, STATIC_DIR / dest_name))
+def parse_candidates(source_dir: Path) -> list[Photo]:
+    # The Desktop rarely changes between runs, so matches are cached per directory and
+    # keyed by its mtime (which moves whenever an entry is added, removed or renamed).
+    # On a change only names not seen before are matched again. Invalid dates are cached
+    # too, so their warnings still show up on runs that skip the scan.
+    source_dir = source_dir.resolve()
+    mtime_ns = source_dir.stat().st_mtime_ns
+    index = load_candidate_index(source_dir)
+    matches: dict[str, tuple[str, str]] = index["matches"]
+    invalid: dict[str, str] = index["invalid"]
+    ignored: set[str] = index["ignored"]
+
+    if index["mtime_ns"] != mtime_ns:
+        current_matches: dict[str, tuple[str, str]] = {}
+        current_invalid: dict[str, str] = {}
+        current_ignored: set[str] = set()
+        with os.scandir(source_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                name = entry.name
+                if name in matches:
+                    current_matches[name] = matches[name]
+                elif name in invalid:
+                    current_invalid[name] = invalid[name]
+                elif name in ignored:
+                    current_ignored.add(name)
+                else:
+                    try:
+                        candidate = match_candidate(name)
+                    except ValueError:
+                        current_invalid[name] = name[:8]
+                        continue
+                    if candidate:
+                        current_matches[name] = candidate
+                    else:
+                        current_ignored.add(name)
+        matches, invalid, ignored = current_matches, current_invalid, current_ignored
+        save_candidate_index(source_dir, mtime_ns, matches, invalid, ignored)
+
+    for name, raw_date in sorted(invalid.items()):
+        LOGGER.warning("Skipping %s: invalid date %s", name, raw_date)
+
+    photos: list[Photo] = []
+    for name in sorted(matches):
+        raw_date, number = matches[name]
+        date = dt.date.fromisoformat(raw_date)
+        suffix = Path(name).suffix.lower()
+        dest_name = f"{date.isoformat()}-DSC_{number}{suffix}"
+        photos.append(Photo(source_dir / name, date, number, STATIC_DIR / dest_name))
     return photos
 
 
@@ -60,21 +171,74 @@ def prompt_overwrite(photo: Photo) -> bool:
     return reply in {"y", "yes"}
 
 
+def clone_file(source: Path, destination: Path) -> bool:
+    # Copy-on-write clone (APFS clonefile, FICLONE on Linux); False when unsupported.
+    if sys.platform == "darwin":
+        try:
+            clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+        except (OSError, AttributeError):
+            return False
+        return clonefile(os.fsencode(source), os.fsencode(destination), 0) == 0
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+    return False
+
+
+def copy_photo(photo: Photo) -> Photo:
+    # Clone when the filesystem allows it, otherwise copyfile (sendfile/fcopyfile fast
+    # paths); then copystat to keep copy2's metadata. A temp name + replace keeps a
+    # half-written file from ever sitting at the destination. Each copy gets its own
+    # mkdtemp directory (copies share a pid across threads), and the temp file inside
+    # does not exist yet, which clonefile requires.
+    destination = photo.destination
+    tmp_dir = Path(tempfile.mkdtemp(dir=destination.parent, prefix=f".{destination.name}."))
+    tmp_path = tmp_dir / destination.name
+    try:
+        if not clone_file(photo.source, tmp_path):
+            shutil.copyfile(photo.source, tmp_path)
+        shutil.copystat(photo.source, tmp_path)
+        os.replace(tmp_path, destination)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    LOGGER.info("Copied %s -> %s", photo.source, destination)
+    return photo
+
+
 def copy_photos(photos: Iterable[Photo], overwrite: bool) -> list[Photo]:
-    imported: list[Photo] = []
+    to_copy: list[Photo] = []
+    claimed: dict[Path, Photo] = {}
     STATIC_DIR.mkdir(parents=True, exist_ok=True)
 
+    # Prompts stay sequential; the copies themselves are I/O-bound and run in parallel.
     for photo in photos:
+        # Names differing only in case (IMG_1.jpg, IMG_1.JPG) share a destination; the
+        # first one wins so two copies never race on the same file.
+        first = claimed.setdefault(photo.destination, photo)
+        if first is not photo:
+            LOGGER.warning(
+                "Skipping %s: %s already maps to %s",
+                photo.source.name,
+                first.source.name,
+                photo.destination.name,
+            )
+            continue
         if photo.destination.exists():
             if overwrite or prompt_overwrite(photo):
                 LOGGER.info("Overwriting %s with %s", photo.destination.name, photo.source.name)
             else:
                 LOGGER.info("Skipping %s (exists)", photo.destination.name)
                 continue
-        shutil.copy2(photo.source, photo.destination)
-        imported.append(photo)
-        LOGGER.info("Copied %s -> %s", photo.source, photo.destination)
-    return imported
+        to_copy.append(photo)
+
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        return list(executor.map(copy_photo, to_copy))
 
 
 def sanitize_slug(value: str) -> str:
@@ -83,15 +247,16 @@ def sanitize_slug(value: str) -> str:
 
 
 def prompt_slug(date: dt.date, default_slug: str) -> str:
-    prompt = f"Multiple images on {date:%Y-%m-%d}. Enter a custom name (default: {default_slug}): "
+    day = date.isoformat()
+    prompt = f"Multiple images on {day}. Enter a custom name (default: {default_slug}): "
     while True:
         user_input = input(prompt).strip()
         slug = sanitize_slug(user_input) if user_input else default_slug
         if not slug:
             print("Slug cannot be empty.")
             continue
-        if not slug.startswith(f"{date:%Y-%m-%d}"):
-            slug = f"{date:%Y-%m-%d}-{slug}"
+        if not slug.startswith(day):
+            slug = f"{day}-{slug}"
         return slug
 
 
@@ -106,7 +271,7 @@ def choose_slug(date: dt.date, photos: list[Photo]) -> tuple[str, Path]:
     if len(photos) == 1:
         base_slug = photos[0].destination.stem
     else:
-        default = f"{date:%Y-%m-%d}-photos"
+        default = f"{date.isoformat()}-photos"
         base_slug = prompt_slug(date, default)
 
     while True:
@@ -121,7 +286,7 @@ def write_post(post_path: Path, date: dt.date, photos: list[Photo]) -> None:
     images_lines = [f'  {{ src = "static/{p.destination.name}" }},' for p in photos]
     content_lines = [
         "++++",
-        f"date = {date:%Y-%m-%d}",
+        f"date = {date.isoformat()}",
         "images = [",
         *images_lines,
         "]",
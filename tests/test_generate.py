@@ -1,90 +1,562 @@
+import contextlib
 import datetime as dt
+import functools
+import io
+import posixpath
+import re
+import shutil
 import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import ClassVar
 from unittest.mock import patch
 from xml.etree import ElementTree as ET
 
 import blog.generate as gen
 
+# Clark-notation ("{ns}tag") names: literal tags skip ElementPath prefix resolution.
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+FEED_TAG = ATOM_NS + "feed"
+LINK_TAG = ATOM_NS + "link"
+ENTRY_TAG = ATOM_NS + "entry"
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+IMAGE_NS = "{http://www.google.com/schemas/sitemap-image/1.1}"
+
+
+def collect_elements(
+    source, paths: set[str]
+) -> tuple[str, dict[str, list[tuple[dict, str | None]]]]:
+    # One streaming pass: keep (attrib, text) of elements at the given root-relative
+    # paths (e.g. "channel/item/link") and clear each element once it has been seen.
+    collected: dict[str, list[tuple[dict, str | None]]] = {path: [] for path in paths}
+    stack: list[str] = []
+    root_tag = ""
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem.tag)
+            continue
+        path = "/".join(stack[1:])
+        if path in collected:
+            collected[path].append((dict(elem.attrib), elem.text))
+        # The root is the last element to end.
+        root_tag = stack.pop()
+        elem.clear()
+    return root_tag, collected
+
+
+class CacheFileTests(unittest.TestCase):
+    def test_concurrent_writes_to_one_key(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache" / "entry.json"
+            payloads = [str(i).encode("utf-8") * 4096 for i in range(8)]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(
+                    executor.map(lambda i: gen.write_cache_file(path, payloads[i % 8]), range(400))
+                )
+            self.assertIn(path.read_bytes(), payloads)
+            self.assertEqual([entry.name for entry in path.parent.iterdir()], ["entry.json"])
+
 
 class FeedTests(unittest.TestCase):
-    def test_writes_atom_and_rss(self) -> None:
+    # Feeds are written once per class and captured in memory; tests only read them.
+    ENTRY_LINK_PATH = f"{ENTRY_TAG}/{LINK_TAG}"
+    RSS_SELF_PATH = f"channel/{LINK_TAG}"
+    FEED_PATHS: ClassVar[dict[str, frozenset[str]]] = {
+        "feed.xml": frozenset({LINK_TAG, ENTRY_TAG, ENTRY_LINK_PATH}),
+        "rss.xml": frozenset({"channel", RSS_SELF_PATH, "channel/item", "channel/item/link"}),
+    }
+    SITE: dict
+    POST: gen.Post
+    WRITTEN: dict[str, bytes]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.SITE = {
+            "title": "Test Blog",
+            "description": "Testing feeds",
+            "author": "Test Author",
+            "site_url": "http://localhost:8080",
+            "base_url": "",
+            "feed_max_posts": 25,
+        }
+        cls.POST = gen.Post(
+            source=Path("post.md"),
+            title="Hello",
+            date=dt.date(2024, 1, 2),
+            images=["static/photo.jpg"],
+            image_alts=[None],
+            excerpt="Excerpt",
+            layout="photo",
+            body_html="<p>Body</p>",
+            display_date="02 Jan 2024",
+            url="2024/01/hello/",
+            slug="hello",
+            images_meta=[
+                gen.ImageMeta(
+                    path="static/photo.jpg",
+                    width=800,
+                    height=600,
+                    srcset=[("static/photo-480w.jpg", 480), ("static/photo.jpg", 800)],
+                    primary_src="static/photo.jpg",
+                    alt="Alt text",
+                )
+            ],
+        )
+
+        cls.WRITTEN = {}
+
+        def capture(path: Path, data: bytes) -> None:
+            cls.WRITTEN[path.name] = data
+
+        # A missing DIST_DIR makes any write that bypasses emit_file fail.
+        with (
+            patch.object(gen, "DIST_DIR", Path("/nonexistent/dist")),
+            patch.object(gen, "emit_file", capture),
+        ):
+            gen.write_feeds([cls.POST], cls.SITE)
+
+    @classmethod
+    @functools.cache
+    def parsed(cls, name: str) -> tuple[str, dict[str, list[tuple[dict, str | None]]]]:
+        return collect_elements(io.BytesIO(cls.WRITTEN[name]), cls.FEED_PATHS[name])
+
+    def test_writes_both_feeds(self) -> None:
+        self.assertEqual(sorted(self.WRITTEN), ["feed.xml", "rss.xml"])
+
+    def test_atom_feed(self) -> None:
+        atom_tag, atom = self.parsed("feed.xml")
+        self.assertEqual(atom_tag, FEED_TAG)
+        self_links = [attrib for attrib, _ in atom[LINK_TAG] if attrib.get("rel") == "self"]
+        self.assertEqual(len(self_links), 1)
+        self.assertEqual(self_links[0]["href"], "http://localhost:8080/feed.xml")
+
+        self.assertEqual(len(atom[ENTRY_TAG]), 1)
+        entry_links = [attrib["href"] for attrib, _ in atom[self.ENTRY_LINK_PATH]]
+        self.assertEqual(entry_links, ["http://localhost:8080/2024/01/hello/"])
+
+    def test_rss_feed(self) -> None:
+        rss_tag, rss = self.parsed("rss.xml")
+        self.assertEqual(rss_tag, "rss")
+        self.assertEqual(len(rss["channel"]), 1)
+        self.assertEqual(len(rss[self.RSS_SELF_PATH]), 1)
+        rss_self, _ = rss[self.RSS_SELF_PATH][0]
+        self.assertEqual(rss_self["href"], "http://localhost:8080/rss.xml")
+        self.assertEqual(rss_self.get("rel"), "self")
+        self.assertEqual(rss_self.get("type"), "application/rss+xml")
+        self.assertEqual(len(rss["channel/item"]), 1)
+        item_links = [text for _, text in rss["channel/item/link"]]
+        self.assertEqual(item_links, ["http://localhost:8080/2024/01/hello/"])
+
+
+class MarkdownBackendTests(unittest.TestCase):
+    RAW_HTML_POST = (
+        'Intro with <span class="note">inline</span> markup.\n\n'
+        '<iframe src="https://example.com/embed"></iframe>\n\n'
+        "<script>track()</script>\n\n"
+        "| a | b |\n|---|---|\n| 1 | 2 |\n"
+    )
+
+    def test_backends_pass_raw_html_through(self) -> None:
+        # Each backend is selected by disabling the ones make_markdown_renderer prefers.
+        backends = ["cmarkgfm", "mistune", "markdown"]
+        for index, name in enumerate(backends):
+            if getattr(gen, name) is None:
+                continue
+            with self.subTest(backend=name), contextlib.ExitStack() as stack:
+                for preferred in backends[:index]:
+                    stack.enter_context(patch.object(gen, preferred, None))
+                renderer_id, render = gen.make_markdown_renderer()
+                self.assertTrue(renderer_id.startswith(name))
+                html = render(self.RAW_HTML_POST)
+                self.assertIn('<span class="note">inline</span>', html)
+                self.assertIn('<iframe src="https://example.com/embed"></iframe>', html)
+                self.assertIn("<script>track()</script>", html)
+                self.assertIn("<td>1</td>", html)
+
+
+class FrontMatterTests(unittest.TestCase):
+    def test_parses_toml_front_matter(self) -> None:
+        raw = '++++\ndate = 2024-01-02\ntitle = "Hello"\n++++\n\nBody text\n'
+        meta, body = gen.parse_front_matter(raw)
+        self.assertEqual(meta, {"date": dt.date(2024, 1, 2), "title": "Hello"})
+        self.assertEqual(body, "Body text")
+
+    def test_parses_json_front_matter(self) -> None:
+        raw = '+++json\n{"date": "2024-01-02", "images": ["static/a.jpg"]}\n+++\nBody\n'
+        meta, body = gen.parse_front_matter(raw)
+        self.assertEqual(meta, {"date": "2024-01-02", "images": ["static/a.jpg"]})
+        self.assertEqual(body, "Body")
+
+    def test_rejects_non_object_json_front_matter(self) -> None:
+        with self.assertRaises(TypeError):
+            gen.parse_front_matter('+++json\n["static/a.jpg"]\n+++\nBody\n')
+
+    def test_parses_crlf_and_unterminated_closing_line(self) -> None:
+        meta, body = gen.parse_front_matter('+++\r\ntitle = "Hi"\r\n+++ \r\nOne\r\nTwo\r\n')
+        self.assertEqual(meta, {"title": "Hi"})
+        self.assertEqual(body, "One\nTwo")
+
+        meta, body = gen.parse_front_matter('++++\ntitle = "+++"\n++++')
+        self.assertEqual(meta, {"title": "+++"})
+        self.assertEqual(body, "")
+
+    def test_simple_parser_matches_tomllib(self) -> None:
+        fronts = [
+            (
+                'date = 2024-01-02\nimages = [\n  { src = "static/a.jpg", alt = "A" },\n]\n'
+                'layout = "photo"\n'
+            ),
+            'title = "Hi" # note\r\nimages = ["a.jpg", "b.jpg"]\ndraft = false\n',
+            "",
+        ]
+        for front in fronts:
+            with self.subTest(front=front):
+                self.assertEqual(gen.parse_simple_front_matter(front), gen.tomllib.loads(front))
+
+    def test_simple_parser_defers_to_tomllib(self) -> None:
+        fronts = [
+            'title = "a\\"b"\n',
+            "count = 3\n",
+            "date = 2024-01-02T10:00:00\n",
+            '[extra]\nkey = "x"\n',
+            'a = "x"\na = "y"\n',
+        ]
+        for front in fronts:
+            with self.subTest(front=front):
+                self.assertIsNone(gen.parse_simple_front_matter(front))
+
+    def test_rejects_missing_delimiter(self) -> None:
+        with self.assertRaises(ValueError):
+            gen.parse_front_matter("title = 'x'\n")
+
+    def test_rejects_missing_closing_delimiter(self) -> None:
+        with self.assertRaisesRegex(ValueError, r"closing \+\+\+ not found"):
+            gen.parse_front_matter('+++\ntitle = "a +++ b"\n++++\nBody\n')
+
+
+class CollectPostsTests(unittest.TestCase):
+    def write_posts(self, posts_dir: Path, count: int) -> list[str]:
+        # Several posts share a date (ties keep path order) and all share one body, so
+        # cold-cache workers race on the same Markdown cache entry.
+        slugs = []
+        for i in range(count):
+            date = dt.date(2024, 1 + i % 3, 1 + i // 6)
+            slug = f"post-{i:02d}"
+            path = posts_dir / f"{date.year}" / f"{date.month:02d}" / f"{slug}.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                f'+++\ndate = {date.isoformat()}\ntitle = "Post {i}"\n+++\n\nShared *body*.\n',
+                encoding="utf-8",
+            )
+            slugs.append(slug)
+        return slugs
+
+    def collect(self, posts_dir: Path, cache_dir: Path) -> list[gen.Post]:
+        with patch.object(gen, "POSTS_DIR", posts_dir), patch.object(gen, "CACHE_DIR", cache_dir):
+            return gen.collect_posts()
+
+    def test_symlinked_directories_are_not_followed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            posts_dir = Path(tmp) / "posts"
+            slugs = self.write_posts(posts_dir, 2)
+            (posts_dir / "2024" / "loop").symlink_to(posts_dir, target_is_directory=True)
+
+            posts = self.collect(posts_dir, Path(tmp) / "cache")
+
+        self.assertEqual(sorted(post.slug for post in posts), slugs)
+
+    def test_pools_match_serial_parse_on_cold_cache(self) -> None:
+        for count, cpu_count in [
+            (gen.PARALLEL_PARSE_MIN_POSTS + 4, 1),
+            (gen.PROCESS_PARSE_MIN_POSTS + 4, 2),
+        ]:
+            with self.subTest(count=count), tempfile.TemporaryDirectory() as tmp:
+                posts_dir = Path(tmp) / "posts"
+                slugs = self.write_posts(posts_dir, count)
+                with patch.object(gen, "PARALLEL_PARSE_MIN_POSTS", count + 1):
+                    expected = self.collect(posts_dir, Path(tmp) / "serial-cache")
+                with patch.object(gen.os, "cpu_count", return_value=cpu_count):
+                    posts = self.collect(posts_dir, Path(tmp) / "cache")
+
+                self.assertEqual(posts, expected)
+                self.assertEqual(sorted(post.slug for post in posts), slugs)
+                self.assertEqual(
+                    [(post.date, post.slug) for post in posts],
+                    sorted(
+                        sorted((post.date, post.slug) for post in posts),
+                        key=lambda entry: entry[0],
+                        reverse=True,
+                    ),
+                )
+                self.assertEqual(
+                    {post.body_html.strip() for post in posts}, {"<p>Shared <em>body</em>.</p>"}
+                )
+
+
+class ImageDimensionsTests(unittest.TestCase):
+    def test_reads_dimensions_from_headers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cases = [
+                ("plain.jpg", "RGB", {}),
+                ("progressive.jpg", "RGB", {"progressive": True, "exif": b"Exif\x00\x00MM"}),
+                ("image.png", "RGBA", {}),
+                ("lossy.webp", "RGB", {}),
+                ("lossless.webp", "RGB", {"lossless": True}),
+                ("alpha.webp", "RGBA", {}),
+            ]
+            for name, mode, options in cases:
+                path = Path(tmp) / name
+                gen.Image.new(mode, (123, 45)).save(path, **options)
+                with self.subTest(name=name):
+                    self.assertEqual(gen.fast_image_dimensions(str(path)), (123, 45))
+
+            other = Path(tmp) / "image.gif"
+            gen.Image.new("RGB", (12, 34)).save(other)
+            self.assertIsNone(gen.fast_image_dimensions(str(other)))
+            self.assertEqual(gen.probe_image_dimensions(str(other), 0, 0), (12, 34))
+
+
+class ImagePipelineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name) / "site"
+        self.dist_dir = Path(tmp.name) / "dist"
+        cache_dir = Path(tmp.name) / "cache"
+        self.variants_dir = cache_dir / "variants"
+        self.manifest: dict = {}
+        for name, value in [
+            ("ROOT", self.root),
+            ("DIST_DIR", self.dist_dir),
+            ("CACHE_DIR", cache_dir),
+            ("IMAGE_MANIFEST_PATH", cache_dir / "images.json"),
+            ("IMAGE_MANIFEST", self.manifest),
+        ]:
+            self.enterContext(patch.object(gen, name, value))
+        self.resize_jobs = self.enterContext(
+            patch.object(gen, "run_resize_jobs", wraps=gen.run_resize_jobs)
+        )
+
+        (self.root / "static").mkdir(parents=True)
+        gen.Image.new("RGB", (1200, 800), (200, 120, 40)).save(self.root / "static/photo.jpg")
+        gen.Image.new("RGBA", (900, 600), (10, 80, 160, 128)).save(self.root / "static/art.png")
+
+    def build(self, *images: str) -> list[gen.ImageMeta]:
+        # A fresh in-memory manifest each run, as in a new build process.
+        self.manifest.clear()
+        post = gen.Post(
+            source=Path("post.md"),
+            title=None,
+            date=dt.date(2024, 1, 2),
+            images=list(images),
+            image_alts=[None] * len(images),
+            excerpt=None,
+            layout="photo",
+            body_html="",
+            display_date="02 Jan 2024",
+            url="2024/01/post/",
+            slug="post",
+        )
+        gen.attach_image_meta([post])
+        return post.images_meta
+
+    def rendered_outputs(self) -> list[tuple[str, str | None]]:
+        # (cached file suffix, format) of every output handed to the last run_resize_jobs.
+        (jobs,), _ = self.resize_jobs.call_args
+        return [
+            (path.name.split("-", 1)[1], fmt)
+            for _, steps in jobs
+            for _, _, outputs in steps
+            for path, fmt in outputs
+        ]
+
+    def test_srcsets_ascend_and_sources_follow_format_order(self) -> None:
+        photo, art = self.build("static/photo.jpg", "static/art.png")
+        mimes = [mime for _, _, mime in gen.MODERN_FORMATS]
+        for meta, suffix, widths in [
+            (photo, ".jpg", [480, 720, 1080, 1200]),
+            (art, ".png", [480, 720, 900]),
+        ]:
+            with self.subTest(image=meta.path):
+                self.assertEqual([width for _, width in meta.srcset], widths)
+                self.assertEqual(meta.srcset[-1][0], meta.path)
+                self.assertTrue(all(path.endswith(suffix) for path, _ in meta.srcset))
+                self.assertEqual([mime for mime, _ in meta.sources], mimes)
+                for _, srcset in meta.sources:
+                    self.assertEqual([width for _, width in srcset], widths)
+                for path, _ in [meta.srcset[0], *(srcset[0] for _, srcset in meta.sources)]:
+                    self.assertTrue((self.dist_dir / path).is_file(), path)
+
+    def test_formats_without_an_encoder_are_dropped(self) -> None:
+        self.assertFalse(gen.encoder_available("NOPE", ".nope"))
+        for fmt, suffix, _ in gen.MODERN_FORMATS:
+            self.assertTrue(gen.encoder_available(fmt, suffix), fmt)
+
+    def test_preload_type_matches_first_source(self) -> None:
+        (photo,) = self.build("static/photo.jpg")
+        preload = gen.image_preload(photo)
+        if photo.sources:
+            mime, srcset = photo.sources[0]
+            self.assertEqual(preload["type"], mime)
+            self.assertEqual(preload["srcset"], srcset)
+            self.assertIn(preload["src"], [path for path, _ in srcset])
+        else:
+            self.assertIsNone(preload["type"])
+            self.assertEqual(preload["srcset"], photo.srcset)
+
+    def test_second_run_reuses_cached_variants(self) -> None:
+        first = self.build("static/photo.jpg", "static/art.png")
+        self.assertTrue(self.rendered_outputs())
+
+        shutil.rmtree(self.dist_dir)
+        second = self.build("static/photo.jpg", "static/art.png")
+        self.assertEqual(self.rendered_outputs(), [])
+        self.assertEqual(second, first)
+        self.assertTrue((self.dist_dir / "static/photo-480w.jpg").is_file())
+
+    def test_pooled_run_after_inline_run(self) -> None:
+        # The inline run starts the backend in this process (libvips spins up its worker
+        # threads); the pooled run after it must still finish.
+        with patch.object(gen.os, "cpu_count", return_value=1):
+            self.build("static/photo.jpg")
+        gen.Image.new("RGB", (1000, 700), (30, 160, 90)).save(self.root / "static/other.jpg")
+        with patch.object(gen.os, "cpu_count", return_value=4):
+            art, other = self.build("static/art.png", "static/other.jpg")
+        self.assertGreater(len(self.resize_jobs.call_args.args[0]), 1)
+        for meta in (art, other):
+            for path, _ in meta.srcset[:-1]:
+                self.assertTrue((self.dist_dir / path).is_file(), path)
+
+    def test_deleted_variant_is_the_only_one_rebuilt(self) -> None:
+        self.build("static/photo.jpg")
+        kept = {
+            path: path.stat().st_mtime_ns
+            for path in (self.dist_dir / "static").iterdir()
+            if path.name != "photo-720w.jpg"
+        }
+        (self.dist_dir / "static/photo-720w.jpg").unlink()
+        for cached in self.variants_dir.glob("*-720w.jpg"):
+            cached.unlink()
+
+        self.build("static/photo.jpg")
+        self.assertEqual(self.rendered_outputs(), [("720w.jpg", None)])
+        self.assertTrue((self.dist_dir / "static/photo-720w.jpg").is_file())
+        for path, mtime_ns in kept.items():
+            self.assertEqual(path.stat().st_mtime_ns, mtime_ns, path.name)
+
+
+class MinifyCssTests(unittest.TestCase):
+    def test_collapses_whitespace_and_keeps_strings(self) -> None:
+        css = (
+            "/* theme */\n.post  figure > img ,\nhr {\n  margin : 0 auto ;\n}\n"
+            'body { font-family: "Andale  Mono", monospace; content: "/* { */"; }\n'
+        )
+        self.assertEqual(
+            gen.minify_css(css),
+            ".post figure>img,hr{margin :0 auto;}"
+            'body{font-family:"Andale  Mono",monospace;content:"/* { */";}',
+        )
+
+
+class PaginationTests(unittest.TestCase):
+    # The stylesheet is inlined, so the favicon and feed links carry the asset prefix.
+    LINK_RE = re.compile(
+        r'<a href="([^"]*)">(Newer|Older)</a>|<link rel="icon"[^>]* href="([^"]*)"'
+    )
+
+    def build_pages(self, post_count: int) -> dict[str, dict[str, str]]:
         with tempfile.TemporaryDirectory() as tmp:
             dist_dir = Path(tmp) / "dist"
-            dist_dir.mkdir()
+            self.enterContext(patch.object(gen, "DIST_DIR", dist_dir))
+            self.enterContext(patch.object(gen, "CACHE_DIR", Path(tmp) / "cache"))
+            site = {"title": "Test Blog", "base_url": "", "site_url": "", "inline_style": ""}
+            posts = [
+                gen.Post(
+                    source=Path(f"post-{i}.md"),
+                    title=f"Post {i}",
+                    date=dt.date(2024, 1, 1),
+                    images=[],
+                    image_alts=[],
+                    excerpt=None,
+                    layout="text",
+                    body_html="<p>Body</p>",
+                    display_date="01 Jan 2024",
+                    url=f"2024/01/post-{i}/",
+                    slug=f"post-{i}",
+                )
+                for i in range(post_count)
+            ]
+            gen.build(posts, site, gen.make_env())
+
+            pages = {}
+            for path in sorted(dist_dir.rglob("index.html")):
+                page_dir = path.parent.relative_to(dist_dir).as_posix()
+                if page_dir != "." and not page_dir.startswith("page/"):
+                    continue
+                links = {}
+                for match in self.LINK_RE.finditer(path.read_text(encoding="utf-8")):
+                    href, label, icon = match.groups()
+                    # Resolve relative to the page directory, as a browser would.
+                    links[label or "icon"] = posixpath.normpath(
+                        posixpath.join(page_dir, href or icon)
+                    )
+                pages[page_dir] = links
+            return pages
 
-            site = {
-                "title": "Test Blog",
-                "description": "Testing feeds",
-                "author": "Test Author",
-                "site_url": "http://localhost:8080",
-                "base_url": "",
-                "feed_max_posts": 25,
-            }
+    def test_links_resolve_from_every_page(self) -> None:
+        pages = self.build_pages(2 * gen.POSTS_PER_PAGE + 1)
 
+        self.assertEqual(
+            pages,
+            {
+                ".": {"icon": "favicon.png", "Older": "page/2"},
+                "page/2": {"icon": "favicon.png", "Newer": ".", "Older": "page/3"},
+                "page/3": {"icon": "favicon.png", "Newer": "page/2"},
+            },
+        )
+
+
+class SitemapTests(unittest.TestCase):
+    def test_writes_sitemap_with_images(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            dist_dir = Path(tmp) / "dist"
+            dist_dir.mkdir()
+
+            site = {"site_url": "http://localhost:8080", "base_url": ""}
             post = gen.Post(
                 source=Path("post.md"),
                 title="Hello",
                 date=dt.date(2024, 1, 2),
                 images=["static/photo.jpg"],
                 image_alts=[None],
-                excerpt="Excerpt",
+                excerpt=None,
                 layout="photo",
-                body_html="<p>Body</p>",
+                body_html="",
                 display_date="02 Jan 2024",
-                url="2024/01/hello/",
-                slug="hello",
-                images_meta=[
-                    gen.ImageMeta(
-                        path="static/photo.jpg",
-                        width=800,
-                        height=600,
-                        srcset=[("static/photo-480w.jpg", 480), ("static/photo.jpg", 800)],
-                        primary_src="static/photo.jpg",
-                        alt="Alt text",
-                    )
-                ],
+                url="2024/01/a&b/",
+                slug="a&b",
+                images_meta=[gen.ImageMeta(path="static/photo.jpg", width=800, height=600)],
             )
 
             with patch.object(gen, "DIST_DIR", dist_dir):
-                gen.write_feeds([post], site)
-
-            atom_path = dist_dir / "feed.xml"
-            rss_path = dist_dir / "rss.xml"
-            self.assertTrue(atom_path.exists())
-            self.assertTrue(rss_path.exists())
-
-            atom = ET.parse(atom_path).getroot()
-            self.assertEqual(atom.tag, "{http://www.w3.org/2005/Atom}feed")
-            ns = {"atom": "http://www.w3.org/2005/Atom"}
-            self_link = atom.find("atom:link[@rel='self']", ns)
-            self.assertIsNotNone(self_link)
-            assert self_link is not None
-            self.assertEqual(self_link.attrib["href"], "http://localhost:8080/feed.xml")
-
-            entries = atom.findall("atom:entry", ns)
-            self.assertEqual(len(entries), 1)
-            entry_link = entries[0].find("atom:link", ns)
-            self.assertIsNotNone(entry_link)
-            assert entry_link is not None
-            self.assertEqual(entry_link.attrib["href"], "http://localhost:8080/2024/01/hello/")
-
-            rss = ET.parse(rss_path).getroot()
-            channel = rss.find("channel")
-            self.assertIsNotNone(channel)
-            assert channel is not None
-            rss_ns = {"atom": "http://www.w3.org/2005/Atom"}
-            rss_self = channel.find("atom:link", rss_ns)
-            self.assertIsNotNone(rss_self)
-            assert rss_self is not None
-            self.assertEqual(rss_self.attrib["href"], "http://localhost:8080/rss.xml")
-            self.assertEqual(rss_self.attrib.get("rel"), "self")
-            self.assertEqual(rss_self.attrib.get("type"), "application/rss+xml")
-            items = channel.findall("item")
-            self.assertEqual(len(items), 1)
-            item_link = items[0].findtext("link")
-            self.assertEqual(item_link, "http://localhost:8080/2024/01/hello/")
+                gen.write_sitemap([post], site)
+
+            sitemap_path = dist_dir / "sitemap.xml"
+            self.assertTrue(sitemap_path.read_text(encoding="utf-8").endswith("</urlset>\n"))
+
+            root = ET.parse(sitemap_path).getroot()
+            self.assertEqual(root.tag, SITEMAP_NS + "urlset")
+            urls = list(root.iterfind(SITEMAP_NS + "url"))
+            locs = [url.findtext(SITEMAP_NS + "loc") for url in urls]
+            self.assertEqual(locs, ["http://localhost:8080/", "http://localhost:8080/2024/01/a&b/"])
+            self.assertEqual(urls[0].findtext(SITEMAP_NS + "lastmod"), "2024-01-02")
+            image_locs = [
+                image.findtext(IMAGE_NS + "loc")
+                for url in urls
+                for image in url.iterfind(IMAGE_NS + "image")
+            ]
+            self.assertEqual(image_locs, ["http://localhost:8080/static/photo.jpg"])
 
 
 if __name__ == "__main__":
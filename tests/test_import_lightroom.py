@@ -0,0 +1,140 @@
+import datetime as dt
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import scripts.import_lightroom as lr
+
+
+class SplitSourceNameTests(unittest.TestCase):
+    def test_agrees_with_source_pattern(self) -> None:
+        names = [
+            "20240102-DSC_0001.jpg",
+            "20240102-dsc_12345.JPG",
+            "20240102-DSC_001.jpg",
+            "20240102-DSC_0001.jpeg",
+            "2024012-DSC_0001.jpg",
+            "20240102_DSC_0001.jpg",
+            "20240102-DSC_00a1.jpg",
+            "notes.txt",
+            ".jpg",
+        ]
+        for name in names:
+            match = lr.SOURCE_PATTERN.match(name)
+            expected = (match.group("date"), match.group("num")) if match else None
+            with self.subTest(name=name):
+                self.assertEqual(lr.split_source_name(name), expected)
+
+
+class CandidateIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source_dir = Path(tmp.name) / "Desktop"
+        self.source_dir.mkdir()
+        self.index_path = Path(tmp.name) / "cache" / "lightroom_index.json"
+        self.enterContext(patch.object(lr, "CANDIDATE_INDEX_PATH", self.index_path))
+        self.enterContext(patch.object(lr, "STATIC_DIR", Path(tmp.name) / "static"))
+        for name in ("20240102-DSC_0001.jpg", "20241399-DSC_0002.jpg", "notes.txt"):
+            (self.source_dir / name).touch()
+
+    def parse(self) -> tuple[list[str], list[str]]:
+        with self.assertLogs(lr.LOGGER, "WARNING") as logs:
+            photos = lr.parse_candidates(self.source_dir)
+        return [photo.destination.name for photo in photos], logs.output
+
+    def test_cached_runs_match_and_warn_like_the_first(self) -> None:
+        first = self.parse()
+        with patch.object(lr, "match_candidate", side_effect=AssertionError("rescanned")):
+            cached = self.parse()
+
+        self.assertEqual(first[0], ["2024-01-02-DSC_0001.jpg"])
+        self.assertEqual(len(first[1]), 1)
+        self.assertIn("20241399-DSC_0002.jpg: invalid date 20241399", first[1][0])
+        self.assertEqual(cached, first)
+
+    def test_new_files_are_matched_after_a_change(self) -> None:
+        self.parse()
+        (self.source_dir / "20240103-DSC_0003.jpg").touch()
+        (self.source_dir / "notes.txt").unlink()
+        # Coarse directory timestamps could otherwise hide the change.
+        os.utime(self.source_dir, ns=(1, 1))
+        with patch.object(lr, "match_candidate", wraps=lr.match_candidate) as match:
+            names, _ = self.parse()
+
+        match.assert_called_once_with("20240103-DSC_0003.jpg")
+        self.assertEqual(names, ["2024-01-02-DSC_0001.jpg", "2024-01-03-DSC_0003.jpg"])
+
+    def test_version_mismatch_rescans(self) -> None:
+        self.parse()
+        data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self.assertEqual(data["version"], lr.CANDIDATE_INDEX_VERSION)
+        data["version"] -= 1
+        self.index_path.write_text(json.dumps(data), encoding="utf-8")
+
+        with patch.object(lr, "match_candidate", wraps=lr.match_candidate) as match:
+            names, _ = self.parse()
+
+        self.assertEqual(match.call_count, 3)
+        self.assertEqual(names, ["2024-01-02-DSC_0001.jpg"])
+        data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self.assertEqual(data["version"], lr.CANDIDATE_INDEX_VERSION)
+
+    def test_unversioned_index_is_ignored(self) -> None:
+        self.index_path.parent.mkdir()
+        legacy = {"mtime_ns": 0, "matches": {}, "ignored": []}
+        self.index_path.write_text(json.dumps({str(self.source_dir.resolve()): legacy}))
+
+        names, _ = self.parse()
+
+        self.assertEqual(names, ["2024-01-02-DSC_0001.jpg"])
+        data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self.assertEqual(list(data["sources"]), [str(self.source_dir.resolve())])
+
+
+class CopyPhotosTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source_dir = Path(tmp.name) / "Desktop"
+        self.source_dir.mkdir()
+        self.static_dir = Path(tmp.name) / "static"
+        self.enterContext(patch.object(lr, "STATIC_DIR", self.static_dir))
+
+    def photo(self, name: str, data: bytes) -> lr.Photo:
+        source = self.source_dir / name
+        source.write_bytes(data)
+        os.utime(source, ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+        date = dt.date(2024, 1, 2)
+        destination = self.static_dir / f"2024-01-02-DSC_{name[13:17]}.jpg"
+        return lr.Photo(source, date, name[13:17], destination)
+
+    def test_copies_content_and_mtime_without_leftovers(self) -> None:
+        photos = [self.photo(f"20240102-DSC_{i:04d}.jpg", bytes([i]) * 4096) for i in range(12)]
+        imported = lr.copy_photos(photos, overwrite=False)
+
+        self.assertEqual(imported, photos)
+        for photo in photos:
+            self.assertEqual(photo.destination.read_bytes(), photo.source.read_bytes())
+            self.assertEqual(photo.destination.stat().st_mtime_ns, photo.source.stat().st_mtime_ns)
+        self.assertEqual(len(list(self.static_dir.iterdir())), len(photos))
+
+    def test_sources_sharing_a_destination_are_copied_once(self) -> None:
+        lower = self.photo("20240102-DSC_0001.jpg", b"lower")
+        upper = self.photo("20240102-DSC_0001.JPG", b"upper")
+        self.assertEqual(lower.destination, upper.destination)
+
+        with self.assertLogs(lr.LOGGER, "WARNING") as logs:
+            imported = lr.copy_photos([upper, lower], overwrite=False)
+
+        self.assertEqual(imported, [upper])
+        self.assertEqual(upper.destination.read_bytes(), b"upper")
+        self.assertIn("20240102-DSC_0001.jpg", logs.output[0])
+        self.assertEqual([p.name for p in self.static_dir.iterdir()], ["2024-01-02-DSC_0001.jpg"])
+
+
+if __name__ == "__main__":
+    unittest.main()